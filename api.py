@@ -0,0 +1,359 @@
+"""
+Headless HTTP API for the Expense Analyzer.
+Lets other services upload a CSV and fetch categorized transactions,
+aggregates and insights without going through the Streamlit app.
+
+Endpoints:
+    POST /datasets                   Upload a CSV, returns its dataset_id
+    POST /categorize                 Upload a CSV, returns categorized transactions
+    GET  /datasets/<id>/transactions Categorized transactions
+    GET  /datasets/<id>/summary      Total, top category, average and monthly change
+    GET  /datasets/<id>/categories   Spending per category
+    GET  /datasets/<id>/monthly      Spending per month
+    GET  /datasets/<id>/insights     Insights about the spending
+    GET  /health                     Liveness check
+
+A dataset_id is the SHA-256 of the uploaded CSV together with the current
+categorization settings (the same key the app's dataset store uses), so
+uploading the same file twice reuses the work done the first time, while a
+new keyword or a retrained model gives a fresh result.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from expense_analyzer import process_csv, categorize_transactions
+from dataset_store import settings_fingerprint
+from ai_insights import generate_ai_insights
+import utils
+
+# Largest CSV we accept in one request
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+
+# How many processed datasets to keep in memory
+MAX_CACHED_DATASETS = 32
+
+# Size of the blocks we read uploads in
+READ_CHUNK_BYTES = 64 * 1024
+
+def _records(df):
+    """
+    Convert a DataFrame into JSON-ready records.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        list: One dict per row
+    """
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+def _summary(df):
+    """
+    Collect the headline numbers shown at the bottom of the app.
+
+    Args:
+        df: DataFrame with categorized transactions
+
+    Returns:
+        dict: Total spending, top category, average purchase and monthly change
+    """
+    top_category = utils.get_top_spending_category(df)
+    return {
+        "total_expenses": float(utils.get_total_expenses(df)),
+        "top_category": {
+            "category": top_category["category"],
+            "amount": float(top_category["amount"])
+        },
+        "average_transaction": float(utils.get_average_transaction(df)),
+        "month_over_month_change": float(utils.get_month_over_month_change(df))
+    }
+
+# What each GET /datasets/<id>/<view> returns
+VIEWS = {
+    "transactions": _records,
+    "summary": _summary,
+    "categories": lambda df: _records(utils.get_category_stats(df)),
+    "monthly": lambda df: _records(utils.get_monthly_totals(df)),
+    "insights": lambda df: {"insights": generate_ai_insights(df)}
+}
+
+class DatasetCache:
+    """
+    Thread-safe LRU cache of categorized datasets and their rendered responses,
+    keyed by dataset_id.
+    """
+
+    def __init__(self, max_datasets=MAX_CACHED_DATASETS, work_slots=None):
+        self.max_datasets = max_datasets
+        self.work_slots = work_slots or threading.BoundedSemaphore(8)
+        self._datasets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_id):
+        """
+        Look up a dataset entry.
+
+        Args:
+            dataset_id (str): Hash of the CSV and categorization settings
+
+        Returns:
+            dict: Entry with the categorized DataFrame and cached responses, or None
+        """
+        with self._lock:
+            entry = self._datasets.get(dataset_id)
+            if entry is not None:
+                self._datasets.move_to_end(dataset_id)
+            return entry
+
+    def add(self, dataset_id, df):
+        """
+        Store a categorized dataset, evicting the least recently used one if full.
+
+        Args:
+            dataset_id (str): Hash of the CSV and categorization settings
+            df: Categorized DataFrame
+
+        Returns:
+            dict: The cache entry (an existing one wins if another request got there first)
+        """
+        with self._lock:
+            if dataset_id not in self._datasets:
+                self._datasets[dataset_id] = {"df": df, "responses": {}}
+                while len(self._datasets) > self.max_datasets:
+                    self._datasets.popitem(last=False)
+            self._datasets.move_to_end(dataset_id)
+            return self._datasets[dataset_id]
+
+    def response(self, entry, view):
+        """
+        Get the encoded response for a view of a dataset, building it once.
+
+        Args:
+            entry (dict): Cache entry from get() or add()
+            view (str): Name of the view in VIEWS
+
+        Returns:
+            bytes: JSON response body
+        """
+        body = entry["responses"].get(view)
+        if body is None:
+            with self.work_slots:
+                body = json.dumps(VIEWS[view](entry["df"])).encode('utf-8')
+            with self._lock:
+                body = entry["responses"].setdefault(view, body)
+        return body
+
+class APIError(Exception):
+    """
+    An error that should be sent back to the client with an HTTP status.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes API requests to the analysis pipeline.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    # Close keep-alive connections that sit idle for this long
+    timeout = 30
+
+    # Headers and body are written separately; without this, delayed ACKs
+    # add ~40ms to every request on a reused connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle(self._route_get)
+
+    def do_POST(self):
+        self._handle(self._route_post)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _handle(self, route):
+        """
+        Run a route and turn its result or error into a JSON response.
+
+        Args:
+            route: Function returning (status, body bytes)
+        """
+        try:
+            status, body = route()
+        except APIError as e:
+            status, body = e.status, json.dumps({"error": str(e)}).encode('utf-8')
+        except Exception as e:
+            status, body = 500, json.dumps({"error": f"Internal error: {str(e)}"}).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status >= 400:
+            # Part of the request body may still be unread, so don't reuse the connection
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route_get(self):
+        parts = self.path.split('?')[0].strip('/').split('/')
+
+        if parts == ['health']:
+            return 200, b'{"status": "ok"}'
+
+        if len(parts) == 3 and parts[0] == 'datasets' and parts[2] in VIEWS:
+            entry = self.server.cache.get(parts[1])
+            if entry is None:
+                raise APIError(404, f"Unknown dataset '{parts[1]}'. Upload it to /datasets first.")
+            return 200, self.server.cache.response(entry, parts[2])
+
+        raise APIError(404, f"No such endpoint: GET {self.path}")
+
+    def _route_post(self):
+        path = self.path.split('?')[0].strip('/')
+        if path not in ('datasets', 'categorize'):
+            raise APIError(404, f"No such endpoint: POST {self.path}")
+
+        dataset_id, entry, cached = self._load_upload()
+        if path == 'datasets':
+            body = {"dataset_id": dataset_id, "rows": len(entry["df"]), "cached": cached}
+            return (200 if cached else 201), json.dumps(body).encode('utf-8')
+
+        transactions = self.server.cache.response(entry, 'transactions')
+        prefix = json.dumps({"dataset_id": dataset_id})[:-1].encode('utf-8')
+        return 200, prefix + b', "transactions": ' + transactions + b'}'
+
+    def _read_body(self):
+        """
+        Stream the request body, hashing it as it arrives.
+
+        Handles both Content-Length and chunked uploads. The digest also
+        covers the categorization settings, matching dataset_store.dataset_key.
+
+        Returns:
+            tuple: (dataset_id, body bytes)
+        """
+        digest = hashlib.sha256()
+        buffer = io.BytesIO()
+
+        def take(data):
+            if buffer.tell() + len(data) > MAX_UPLOAD_BYTES:
+                raise APIError(413, f"Upload is larger than {MAX_UPLOAD_BYTES} bytes.")
+            digest.update(data)
+            buffer.write(data)
+
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            while True:
+                try:
+                    size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                except ValueError:
+                    raise APIError(400, "Malformed chunked upload.")
+                if size == 0:
+                    # Skip any trailer headers
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                while size > 0:
+                    data = self.rfile.read(min(size, READ_CHUNK_BYTES))
+                    if not data:
+                        raise APIError(400, "Upload ended early.")
+                    take(data)
+                    size -= len(data)
+                self.rfile.readline()
+        else:
+            try:
+                remaining = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                raise APIError(400, "Content-Length must be a number.")
+            if remaining > MAX_UPLOAD_BYTES:
+                raise APIError(413, f"Upload is larger than {MAX_UPLOAD_BYTES} bytes.")
+            while remaining > 0:
+                data = self.rfile.read(min(remaining, READ_CHUNK_BYTES))
+                if not data:
+                    raise APIError(400, "Upload ended early.")
+                take(data)
+                remaining -= len(data)
+
+        if buffer.tell() == 0:
+            raise APIError(400, "Send the CSV file as the request body.")
+        digest.update(settings_fingerprint())
+        return digest.hexdigest(), buffer.getvalue()
+
+    def _load_upload(self):
+        """
+        Read an uploaded CSV and categorize it, unless it's already cached.
+
+        Returns:
+            tuple: (dataset_id, cache entry, whether it was already cached)
+        """
+        dataset_id, body = self._read_body()
+        entry = self.server.cache.get(dataset_id)
+        if entry is not None:
+            return dataset_id, entry, True
+
+        # Only problems with the uploaded file are the client's fault;
+        # anything raised while categorizing is a server error
+        with self.server.work_slots:
+            try:
+                df = process_csv(io.BytesIO(body))
+            except ValueError as e:
+                raise APIError(400, str(e))
+            df = categorize_transactions(df)
+        return dataset_id, self.server.cache.add(dataset_id, df), False
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    HTTP server that gives each connection its own thread, so idle
+    keep-alive clients can't lock anyone out, and limits how many requests
+    run the analysis pipeline at the same time.
+    """
+
+    # Connections wait here until the server thread accepts them
+    request_queue_size = 128
+
+    def __init__(self, address, workers=8, quiet=False):
+        super().__init__(address, AnalysisRequestHandler)
+        self.work_slots = threading.BoundedSemaphore(workers)
+        self.cache = DatasetCache(work_slots=self.work_slots)
+        self.quiet = quiet
+
+def create_server(host='127.0.0.1', port=8000, workers=8, quiet=False):
+    """
+    Create an API server (call serve_forever() on it to start handling requests).
+
+    Args:
+        host (str): Interface to listen on
+        port (int): Port to listen on, 0 picks a free one
+        workers (int): Number of requests allowed to run the pipeline at the same time
+        quiet (bool): Don't log each request
+
+    Returns:
+        AnalysisServer: The server
+    """
+    return AnalysisServer((host, port), workers=workers, quiet=quiet)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Expense Analyzer HTTP API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.workers)
+    print(f"Expense Analyzer API listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
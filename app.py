@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import io
-from expense_analyzer import process_csv, categorize_transactions
+from dataset_store import get_categorized_dataset
 from visualization import create_category_pie_chart, create_monthly_bar_chart, create_category_breakdown_table
 from ai_insights import generate_ai_insights
 import utils
@@ -54,12 +54,12 @@ with st.container():
 # Making sense of your bank statement
 if uploaded_file is not None:
     try:
-        # Working behind the scenes to organize your data
-        df = process_csv(uploaded_file)
-        categorized_df = categorize_transactions(df)
+        # Working behind the scenes to organize your data. Files someone
+        # has already uploaded are shared from disk instead of redone
+        _, categorized_df = get_categorized_dataset(uploaded_file.getvalue())
         
         # Remembering your data so we don't lose it
-        st.session_state.df = df
+        st.session_state.df = categorized_df.drop(columns=['Category'])
         st.session_state.categorized_df = categorized_df
         
         # Let you know we got it!
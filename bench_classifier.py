@@ -0,0 +1,70 @@
+"""
+Throughput benchmark for the fallback classifier.
+Builds a large synthetic statement from the sample data and times feature
+hashing, batched prediction and the full categorization pipeline.
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from expense_analyzer import process_csv, categorize_transactions
+from categorization import categorize_dataframe
+import classifier
+
+def make_transactions(n_rows, distinct_ratio=0.05, seed=0):
+    """
+    Build a synthetic statement by repeating the sample transactions.
+
+    Args:
+        n_rows (int): Number of rows to generate
+        distinct_ratio (float): Rough share of rows with a unique description
+        seed (int): Random seed
+
+    Returns:
+        DataFrame with Date, Description, Amount and Month columns
+    """
+    rng = np.random.default_rng(seed)
+    base = process_csv("complex_transactions.csv")
+    picks = rng.integers(0, len(base), n_rows)
+    df = base.iloc[picks][['Date', 'Description', 'Amount', 'Month']].reset_index(drop=True)
+
+    # Give some rows store numbers so not every description repeats
+    suffixed = rng.random(n_rows) < distinct_ratio
+    store_numbers = pd.Series(rng.integers(0, 100000, n_rows)).astype(str)
+    df.loc[suffixed, 'Description'] = df.loc[suffixed, 'Description'] + " #" + store_numbers[suffixed]
+    return df
+
+def timed(label, n_rows, func):
+    """
+    Run a function once and print its throughput.
+
+    Args:
+        label (str): What is being timed
+        n_rows (int): Rows processed by the function
+        func: Function to call
+
+    Returns:
+        The function's result
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  - {label}: {elapsed:.2f}s ({n_rows / elapsed:,.0f} rows/sec)")
+    return result
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"\n===== CLASSIFIER BENCHMARK ({n_rows:,} rows) =====\n")
+    model = classifier.train_model_from_csv("categorized_transactions.csv")
+    df = make_transactions(n_rows)
+    descriptions = df['Description'].to_numpy()
+    n_distinct = df['Description'].nunique()
+    print(f"{n_distinct:,} distinct descriptions\n")
+
+    sample = df['Description'].unique()[:4096]
+    timed("Feature hashing (one batch)", len(sample), lambda: classifier.featurize(sample))
+    timed("Batched prediction", n_rows, lambda: classifier.predict(model, descriptions))
+    timed("Rules only", n_rows, lambda: categorize_dataframe(df))
+    timed("Rules + fallback classifier", n_rows, lambda: categorize_transactions(df, model=model))
@@ -0,0 +1,57 @@
+"""
+Scaling benchmark for the parallel execution backends.
+Times categorization and the category/month aggregates on a large synthetic
+statement with 1, 2, 4 and 8 workers for each backend, and reports the
+speedup over the serial run.
+"""
+
+import os
+import sys
+import time
+from bench_classifier import make_transactions
+from expense_analyzer import categorize_transactions
+import utils
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+def best_time(func, repeats=3):
+    """
+    Run a function a few times and keep the fastest run.
+
+    Args:
+        func: Function to call
+        repeats (int): Number of runs
+
+    Returns:
+        float: Fastest run in seconds
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"\n===== PARALLEL SCALING BENCHMARK ({n_rows:,} rows, {os.cpu_count()} CPUs) =====\n")
+    df = make_transactions(n_rows, distinct_ratio=0.2)
+    categorized_df = categorize_transactions(df, backend="serial")
+
+    stages = {
+        "categorize": lambda backend, workers: categorize_transactions(df, backend=backend, workers=workers),
+        "aggregate": lambda backend, workers: utils.aggregate_expenses(categorized_df, backend=backend, workers=workers)
+    }
+
+    for stage, run in stages.items():
+        serial = best_time(lambda: run("serial", 1))
+        print(f"{stage}: serial {serial:.2f}s")
+        for backend in ["thread", "process"]:
+            # Warm up the pools so their startup isn't counted
+            for workers in WORKER_COUNTS:
+                run(backend, workers)
+            for workers in WORKER_COUNTS:
+                elapsed = best_time(lambda: run(backend, workers))
+                print(f"  - {backend:7} x{workers}: {elapsed:.2f}s (speedup {serial / elapsed:.2f}x)")
+        print()
@@ -1,6 +1,9 @@
 import json
 import os
 import re
+import numpy as np
+import pandas as pd
+from classifier import load_model, save_model, update_model
 
 # Load the category mapping from JSON file
 def load_category_mapping():
@@ -33,12 +36,166 @@ def load_category_mapping():
             "other": []
         }
 
-def categorize_transaction(description):
+# Fields a rule object in category_mapping.json may use
+RULE_FIELDS = {"keyword", "regex", "word", "sign", "min_amount", "max_amount", "priority", "account"}
+
+def _compile_rule(category, rule, order):
+    """
+    Turn one rule object from the mapping into a compiled rule.
+    
+    Args:
+        category (str): Category the rule assigns
+        rule (dict): Rule object from the mapping
+        order (tuple): Position of the rule in the mapping, used to break ties
+    
+    Returns:
+        dict: Compiled rule
+    
+    Raises:
+        ValueError: If the rule is malformed
+    """
+    unknown = set(rule) - RULE_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown field(s) {sorted(unknown)} in rule for category '{category}'.")
+    if "keyword" in rule and "regex" in rule:
+        raise ValueError(f"A rule for category '{category}' can't have both 'keyword' and 'regex'.")
+    
+    for field in ("keyword", "regex"):
+        if field in rule and not isinstance(rule[field], str):
+            raise ValueError(f"Rule '{field}' for category '{category}' must be text, got {rule[field]!r}.")
+    
+    # Keywords are matched literally, regexes as written
+    if "regex" in rule:
+        pattern = rule["regex"]
+    elif "keyword" in rule:
+        pattern = re.escape(rule["keyword"])
+    else:
+        pattern = None
+    
+    # Lookarounds rather than \b, so keywords like "c++" or "at&t" still
+    # count as whole words
+    if pattern is not None and rule.get("word"):
+        pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+    
+    if pattern is not None:
+        try:
+            pattern = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern in rule for category '{category}': {str(e)}")
+    
+    sign = rule.get("sign")
+    if sign not in (None, "expense", "income"):
+        raise ValueError(f"Rule 'sign' must be 'expense' or 'income', got '{sign}'.")
+    
+    for field in ("priority", "min_amount", "max_amount"):
+        value = rule.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"Rule '{field}' for category '{category}' must be a number, got {value!r}.")
+    
+    return {
+        "category": category,
+        "pattern": pattern,
+        "sign": sign,
+        "min_amount": rule.get("min_amount"),
+        "max_amount": rule.get("max_amount"),
+        "priority": rule.get("priority", 0),
+        "account": rule.get("account"),
+        "order": order
+    }
+
+def compile_rules(category_mapping):
+    """
+    Compile a category mapping into an ordered list of rules.
+    
+    Each category maps to a list of entries. A plain string is a keyword
+    matched anywhere in the description, exactly like before. An object
+    can use these fields:
+        keyword / regex: literal text or a regular expression to look for
+        word: only match whole words
+        sign: "expense" or "income"
+        min_amount / max_amount: bounds on the absolute amount
+        priority: higher numbers are checked first (default 0)
+        account: only apply to rows whose 'Account' column matches
+    
+    Rules are sorted by priority, then account-specific rules before
+    general ones, then by their position in the mapping. All plain
+    keywords of a category are folded into a single rule.
+    
+    Args:
+        category_mapping (dict): Mapping of categories to keywords and rules
+    
+    Returns:
+        list: Compiled rules in the order they should be tried
+    
+    Raises:
+        ValueError: If any rule is malformed
+    """
+    rules = []
+    
+    for category_index, (category, entries) in enumerate(category_mapping.items()):
+        keywords = []
+        for entry_index, entry in enumerate(entries):
+            if isinstance(entry, str):
+                keywords.append(entry)
+            elif isinstance(entry, dict):
+                rules.append(_compile_rule(category, entry, (category_index, entry_index)))
+            else:
+                raise ValueError(f"Entries for category '{category}' must be strings or rule objects.")
+        
+        if keywords:
+            pattern = "|".join(re.escape(keyword) for keyword in keywords)
+            rules.append(_compile_rule(category, {"regex": pattern}, (category_index, 0)))
+    
+    rules.sort(key=lambda rule: (-rule["priority"], rule["account"] is None, rule["order"]))
+    return rules
+
+def _amount_matches(rule, amount):
+    """
+    Check a single amount against a rule's sign and range conditions.
+    
+    Args:
+        rule (dict): Compiled rule
+        amount (float): Transaction amount, or None if unknown
+    
+    Returns:
+        bool: True if the amount satisfies the rule
+    """
+    if rule["sign"] is None and rule["min_amount"] is None and rule["max_amount"] is None:
+        return True
+    if amount is None:
+        return False
+    if rule["sign"] == "expense" and amount >= 0:
+        return False
+    if rule["sign"] == "income" and amount <= 0:
+        return False
+    if rule["min_amount"] is not None and abs(amount) < rule["min_amount"]:
+        return False
+    if rule["max_amount"] is not None and abs(amount) > rule["max_amount"]:
+        return False
+    return True
+
+def _search_all(pattern, texts):
+    """
+    Check which texts a compiled pattern matches.
+    
+    Args:
+        pattern (re.Pattern): Compiled rule pattern
+        texts: Array of strings
+    
+    Returns:
+        numpy.ndarray: Boolean array, True where the pattern was found
+    """
+    search = pattern.search
+    return np.fromiter((search(text) is not None for text in texts), dtype=bool, count=len(texts))
+
+def categorize_transaction(description, amount=None, account=None):
     """
     Categorize a transaction based on its description.
     
     Args:
         description (str): Transaction description
+        amount (float, optional): Transaction amount, needed by amount rules
+        account (str, optional): Account name, needed by account rules
     
     Returns:
         str: Category name
@@ -46,21 +203,93 @@ def categorize_transaction(description):
     if not isinstance(description, str):
         return "Uncategorized"
     
-    # Convert to lowercase for case-insensitive matching
-    desc_lower = description.lower()
+    # Load and compile the category mapping
+    rules = compile_rules(load_category_mapping())
     
-    # Load category mapping
-    category_mapping = load_category_mapping()
-    
-    # Try to match the description to a category
-    for category, keywords in category_mapping.items():
-        for keyword in keywords:
-            if keyword.lower() in desc_lower:
-                return category
+    # Try each rule in priority order
+    for rule in rules:
+        if rule["account"] is not None and rule["account"] != account:
+            continue
+        if not _amount_matches(rule, amount):
+            continue
+        if rule["pattern"] is None or rule["pattern"].search(description):
+            return rule["category"]
     
     # If no match found, return "Other"
     return "Other"
 
+def categorize_dataframe(df, rules=None):
+    """
+    Categorize every transaction in a DataFrame at once.
+    
+    Each rule is evaluated as a boolean mask over the rows that are still
+    unmatched, so adding rules doesn't mean looping over rows in Python.
+    
+    Args:
+        df: DataFrame with a 'Description' column, and optionally 'Amount'
+            and 'Account' columns
+        rules (list, optional): Compiled rules; loaded from the mapping if omitted
+    
+    Returns:
+        numpy.ndarray: Category name for each row
+    """
+    if rules is None:
+        rules = compile_rules(load_category_mapping())
+    
+    # Bank exports repeat the same descriptions a lot, so patterns are
+    # matched against the distinct descriptions and mapped back to rows
+    codes, uniques = pd.factorize(df['Description'])
+    uniques = pd.Series(uniques, dtype=object)
+    unique_is_text = uniques.map(lambda d: isinstance(d, str)).to_numpy(dtype=bool)
+    uniques = uniques.where(unique_is_text, "").to_numpy()
+    is_text = codes >= 0
+    is_text[is_text] = unique_is_text[codes[is_text]]
+    
+    amounts = df['Amount'].to_numpy(dtype=float) if 'Amount' in df.columns else None
+    accounts = df['Account'].to_numpy() if 'Account' in df.columns else None
+    
+    categories = np.full(len(df), "Other", dtype=object)
+    categories[~is_text] = "Uncategorized"
+    remaining = is_text.copy()
+    
+    for rule in rules:
+        if not remaining.any():
+            break
+        
+        # Apply the cheap column checks first to shrink the candidate rows
+        mask = remaining.copy()
+        if rule["account"] is not None:
+            if accounts is None:
+                continue
+            mask &= accounts == rule["account"]
+        if rule["sign"] is not None or rule["min_amount"] is not None or rule["max_amount"] is not None:
+            if amounts is None:
+                continue
+            if rule["sign"] == "expense":
+                mask &= amounts < 0
+            elif rule["sign"] == "income":
+                mask &= amounts > 0
+            if rule["min_amount"] is not None:
+                mask &= np.abs(amounts) >= rule["min_amount"]
+            if rule["max_amount"] is not None:
+                mask &= np.abs(amounts) <= rule["max_amount"]
+        
+        # Run the pattern over whichever is smaller: the distinct
+        # descriptions or the rows that are still candidates
+        if rule["pattern"] is not None:
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0:
+                continue
+            if len(uniques) <= len(candidates):
+                mask[candidates] = _search_all(rule["pattern"], uniques)[codes[candidates]]
+            else:
+                mask[candidates] = _search_all(rule["pattern"], uniques[codes[candidates]])
+        
+        categories[mask] = rule["category"]
+        remaining &= ~mask
+    
+    return categories
+
 def add_keyword_to_category(keyword, category):
     """
     Add a new keyword to a specific category in the mapping.
@@ -87,6 +316,16 @@ def add_keyword_to_category(keyword, category):
         with open('category_mapping.json', 'w') as f:
             json.dump(category_mapping, f, indent=4)
         
-        return True
     except Exception:
         return False
+    
+    # Teach the fallback classifier about the new keyword too. The keyword
+    # is already saved at this point, so a model problem isn't a failure
+    try:
+        model = load_model()
+        if model is not None:
+            save_model(update_model(model, [keyword], [category]))
+    except Exception as e:
+        print(f"Saved the keyword, but couldn't update the fallback model: {str(e)}")
+    
+    return True
@@ -0,0 +1,313 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Where the trained fallback model is stored
+MODEL_PATH = 'category_model.npz'
+
+# Feature settings: character n-gram sizes, hashed into a fixed number of buckets
+NGRAM_SIZES = (2, 3, 4)
+FEATURE_DIM = 4096
+MAX_DESCRIPTION_LENGTH = 64
+
+# Training sets up to this many rows keep their features in memory
+MAX_CACHED_TRAINING_ROWS = 8192
+
+# Labels that mean "we don't know" and should never be learned
+UNKNOWN_CATEGORIES = {"Other", "other", "Uncategorized"}
+
+_HASH_PRIME = np.uint64(0x100000001B3)
+_HASH_SEED = np.uint64(0xCBF29CE484222325)
+
+def featurize(descriptions, dim=FEATURE_DIM):
+    """
+    Turn descriptions into hashed character n-gram features.
+
+    Each description is lowercased, padded with spaces and cut to a fixed
+    width, then every n-gram is hashed with a rolling FNV-style hash using
+    array operations over the whole batch at once.
+
+    Args:
+        descriptions: Sequence of description strings
+        dim (int): Number of hash buckets
+
+    Returns:
+        numpy.ndarray: L2-normalized feature matrix of shape (rows, dim)
+    """
+    width = MAX_DESCRIPTION_LENGTH
+    text = pd.Series(descriptions, dtype=object).fillna("").astype(str).str.lower()
+    text = (" " + text.str.slice(0, width - 2) + " ").str.encode('utf-8')
+
+    chars = np.array(text.tolist(), dtype=f'S{width}').view(np.uint8).reshape(-1, width)
+    lengths = (chars != 0).sum(axis=1)
+    chars = chars.astype(np.uint64)
+    rows = np.arange(len(chars))[:, None]
+
+    flat = []
+    for n in NGRAM_SIZES:
+        positions = width - n + 1
+        hashes = np.full((len(chars), positions), _HASH_SEED ^ np.uint64(n), dtype=np.uint64)
+        for k in range(n):
+            hashes = (hashes ^ chars[:, k:k + positions]) * _HASH_PRIME
+        buckets = (hashes ^ (hashes >> np.uint64(29))) % np.uint64(dim)
+
+        # Only keep n-grams that fit inside each description
+        valid = np.arange(positions)[None, :] + n <= lengths[:, None]
+        flat.append((rows * dim + buckets.astype(np.int64))[valid])
+
+    counts = np.bincount(np.concatenate(flat), minlength=len(chars) * dim).astype(np.float32)
+    features = counts.reshape(len(chars), dim)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return features / norms
+
+def _softmax(logits):
+    """
+    Row-wise softmax.
+
+    Args:
+        logits: Matrix of raw class scores
+
+    Returns:
+        numpy.ndarray: Class probabilities
+    """
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+def _fit(model, descriptions, categories, epochs, learning_rate, batch_size, update_bias=True):
+    """
+    Run mini-batch gradient descent on a model in place.
+
+    Args:
+        model (dict): Model to update
+        descriptions: Training descriptions
+        categories: Training labels, all present in the model's classes
+        epochs (int): Passes over the data
+        learning_rate (float): Step size
+        batch_size (int): Rows per gradient step
+        update_bias (bool): Whether to also learn the per-class bias
+    """
+    class_index = {category: i for i, category in enumerate(model["classes"])}
+    labels = np.array([class_index[category] for category in categories])
+    descriptions = np.asarray(descriptions, dtype=object)
+
+    # Small training sets are featurized once; bigger ones batch by batch
+    # so the dense feature matrix never has to fit in memory all at once
+    cached = None
+    if len(labels) <= MAX_CACHED_TRAINING_ROWS:
+        cached = featurize(descriptions, model["dim"])
+
+    rng = np.random.default_rng(0)
+    for _ in range(epochs):
+        order = rng.permutation(len(labels))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            if cached is not None:
+                features = cached[batch]
+            else:
+                features = featurize(descriptions[batch], model["dim"])
+            probs = _softmax(features @ model["weights"] + model["bias"])
+            probs[np.arange(len(batch)), labels[batch]] -= 1
+            probs /= len(batch)
+            model["weights"] -= learning_rate * (features.T @ probs + model["l2"] * model["weights"])
+            if update_bias:
+                model["bias"] -= learning_rate * probs.sum(axis=0)
+
+def _training_examples(descriptions, categories):
+    """
+    Drop unusable and duplicate training rows.
+
+    Args:
+        descriptions: Transaction descriptions
+        categories: Their categories
+
+    Returns:
+        DataFrame: Distinct description/category pairs
+    """
+    examples = pd.DataFrame({'Description': list(descriptions), 'Category': list(categories)})
+    examples = examples.dropna()
+    examples = examples[~examples['Category'].isin(UNKNOWN_CATEGORIES)]
+    return examples.drop_duplicates()
+
+def train_model(descriptions, categories, epochs=200, learning_rate=2.0, batch_size=256, l2=1e-4):
+    """
+    Train a fallback classifier from already-categorized transactions.
+
+    Args:
+        descriptions: Transaction descriptions
+        categories: Their categories
+        epochs (int): Passes over the data
+        learning_rate (float): Step size
+        batch_size (int): Rows per gradient step
+        l2 (float): Weight decay
+
+    Returns:
+        dict: Trained model
+
+    Raises:
+        ValueError: If there aren't at least two categories to learn from
+    """
+    examples = _training_examples(descriptions, categories)
+    classes = sorted(examples['Category'].unique())
+    if len(classes) < 2:
+        raise ValueError("Need transactions from at least two categories to train a model.")
+
+    model = {
+        "classes": classes,
+        "dim": FEATURE_DIM,
+        "l2": l2,
+        "weights": np.zeros((FEATURE_DIM, len(classes)), dtype=np.float32),
+        "bias": np.zeros(len(classes), dtype=np.float32)
+    }
+    _fit(model, examples['Description'], examples['Category'], epochs, learning_rate, batch_size)
+    return model
+
+def train_model_from_csv(path='categorized_transactions.csv', **kwargs):
+    """
+    Train a fallback classifier from a categorized CSV export.
+
+    Exports such as categorized_transactions.csv also contain the
+    classifier's own guesses, and learning from those would only reinforce
+    its mistakes. So only rows where the current keyword rules give the
+    same category as the file are used; rows no rule matches (the only ones
+    the classifier ever labels) and outdated labels are left out.
+
+    Args:
+        path (str): CSV with 'Description' and 'Category' columns, plus
+            'Amount' and 'Account' if any rules depend on them
+        **kwargs: Passed on to train_model
+
+    Returns:
+        dict: Trained model
+    """
+    # Imported here because categorization imports this module
+    from categorization import categorize_dataframe
+
+    history = pd.read_csv(path)
+    confirmed = categorize_dataframe(history) == history['Category'].to_numpy()
+    history = history[confirmed]
+    return train_model(history['Description'], history['Category'], **kwargs)
+
+def update_model(model, descriptions, categories, epochs=20, learning_rate=1.0):
+    """
+    Incrementally train an existing model on a few new examples.
+
+    New categories get a fresh output column; everything the model has
+    already learned is kept as the starting point. The class biases are
+    left alone so a handful of new examples can't shift every prediction
+    towards their categories.
+
+    Args:
+        model (dict): Model to update in place
+        descriptions: New descriptions (or keywords)
+        categories: Their categories
+        epochs (int): Passes over the new examples
+        learning_rate (float): Step size
+
+    Returns:
+        dict: The updated model
+    """
+    examples = _training_examples(descriptions, categories)
+    if len(examples) == 0:
+        return model
+
+    new_classes = sorted(set(examples['Category']) - set(model["classes"]))
+    if new_classes:
+        model["classes"] = list(model["classes"]) + new_classes
+        model["weights"] = np.hstack([
+            model["weights"], np.zeros((model["dim"], len(new_classes)), dtype=np.float32)
+        ])
+        model["bias"] = np.concatenate([model["bias"], np.zeros(len(new_classes), dtype=np.float32)])
+
+    _fit(model, examples['Description'], examples['Category'], epochs, learning_rate, len(examples), update_bias=False)
+    return model
+
+def predict(model, descriptions, threshold=0.5, batch_size=4096):
+    """
+    Predict categories for descriptions in fixed-size batches.
+
+    Repeated descriptions are only scored once. Predictions below the
+    confidence threshold come back as "Other".
+
+    Args:
+        model (dict): Trained model
+        descriptions: Descriptions to classify
+        threshold (float): Minimum probability to accept a prediction
+        batch_size (int): Distinct descriptions scored per matrix multiply
+
+    Returns:
+        numpy.ndarray: Predicted category for each description
+    """
+    codes, uniques = pd.factorize(pd.Series(descriptions, dtype=object))
+    classes = np.array(model["classes"] + ["Other"], dtype=object)
+
+    unique_labels = np.empty(len(uniques), dtype=np.int64)
+    for start in range(0, len(uniques), batch_size):
+        features = featurize(uniques[start:start + batch_size], model["dim"])
+        probs = _softmax(features @ model["weights"] + model["bias"])
+        best = probs.argmax(axis=1)
+        best[probs.max(axis=1) < threshold] = len(classes) - 1
+        unique_labels[start:start + batch_size] = best
+
+    labels = np.full(len(codes), len(classes) - 1, dtype=np.int64)
+    labels[codes >= 0] = unique_labels[codes[codes >= 0]]
+    return classes[labels]
+
+def save_model(model, path=MODEL_PATH):
+    """
+    Save a model to a NumPy .npz file.
+
+    The model is written under a temporary name and moved into place, so
+    sessions loading it at the same time never see a half-written file.
+
+    Args:
+        model (dict): Model to save
+        path (str): Destination file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        # Writing through the file object stops np.savez adding '.npz' to the name
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(
+                f,
+                classes=np.array(model["classes"]),
+                dim=model["dim"],
+                l2=model["l2"],
+                weights=model["weights"],
+                bias=model["bias"]
+            )
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+def load_model(path=MODEL_PATH):
+    """
+    Load a saved model.
+
+    Args:
+        path (str): Model file
+
+    Returns:
+        dict: The model, or None if no model has been saved yet
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        return {
+            "classes": data["classes"].tolist(),
+            "dim": int(data["dim"]),
+            "l2": float(data["l2"]),
+            "weights": data["weights"],
+            "bias": data["bias"]
+        }
+
+if __name__ == "__main__":
+    # Train from the sample categorized history and save the model
+    print("Training fallback classifier from categorized_transactions.csv...")
+    trained = train_model_from_csv()
+    save_model(trained)
+    print(f"Saved model with {len(trained['classes'])} categories to {MODEL_PATH}")
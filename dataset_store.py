@@ -0,0 +1,169 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from categorization import load_category_mapping
+from classifier import MODEL_PATH
+from expense_analyzer import process_csv, categorize_transactions
+
+# Where processed datasets are kept, shared by every session
+DATASET_DIR = '.dataset_cache'
+
+# Limits on the store; the least recently used files are removed first
+MAX_STORED_DATASETS = 64
+MAX_STORE_BYTES = 2 * 1024 * 1024 * 1024
+
+def settings_fingerprint():
+    """
+    Describe the current categorization settings as bytes.
+
+    Returns:
+        bytes: The keyword mapping plus the saved model's timestamp and size
+    """
+    fingerprint = json.dumps(load_category_mapping(), sort_keys=True)
+    if os.path.exists(MODEL_PATH):
+        stat = os.stat(MODEL_PATH)
+        fingerprint += f"{stat.st_mtime_ns}:{stat.st_size}"
+    return fingerprint.encode('utf-8')
+
+def dataset_key(csv_bytes):
+    """
+    Work out the cache key for an uploaded CSV.
+
+    The key covers the file's contents and the current categorization
+    settings, so changing a keyword or retraining the model gives a fresh key.
+
+    Args:
+        csv_bytes (bytes): Raw contents of the CSV file
+
+    Returns:
+        str: Hex digest identifying the processed dataset
+    """
+    digest = hashlib.sha256(csv_bytes)
+    digest.update(settings_fingerprint())
+    return digest.hexdigest()
+
+def _dataset_path(key):
+    return os.path.join(DATASET_DIR, f"{key}.feather")
+
+def save_dataset(key, df):
+    """
+    Write a processed dataset to an uncompressed Feather file.
+
+    The file is written under a temporary name and moved into place, so
+    sessions never see a half-written file.
+
+    Args:
+        key (str): Key from dataset_key
+        df: Categorized DataFrame
+    """
+    os.makedirs(DATASET_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=DATASET_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        # Compression would force a copy on read, so leave it off
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, _dataset_path(key))
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    prune_datasets(keep=key)
+
+def prune_datasets(keep=None):
+    """
+    Remove the least recently used datasets until the store is within its
+    count and size limits.
+
+    Files whose key is out of date (after a keyword change or retraining)
+    are never opened again, so they age out first. Sessions that still have
+    a removed file open keep their mapping; on systems that won't delete
+    files in use, the file is skipped and tried again next time.
+
+    Args:
+        keep (str, optional): Key that must not be removed, e.g. the one just saved
+    """
+    entries = []
+    for name in os.listdir(DATASET_DIR):
+        if not name.endswith('.feather'):
+            continue
+        try:
+            stat = os.stat(os.path.join(DATASET_DIR, name))
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, name))
+
+    count = len(entries)
+    total_bytes = sum(size for _, size, _ in entries)
+
+    # Oldest first
+    for _, size, name in sorted(entries):
+        if count <= MAX_STORED_DATASETS and total_bytes <= MAX_STORE_BYTES:
+            break
+        if name == f"{keep}.feather":
+            continue
+        try:
+            os.remove(os.path.join(DATASET_DIR, name))
+        except OSError:
+            continue
+        count -= 1
+        total_bytes -= size
+
+def load_dataset(key):
+    """
+    Open a stored dataset read-only through a memory map.
+
+    Columns are backed directly by the mapped file (pandas ArrowDtype), so
+    every session opening the same dataset shares one copy in the OS page
+    cache instead of holding its own.
+
+    Args:
+        key (str): Key from dataset_key
+
+    Returns:
+        DataFrame: The categorized transactions, or None if not stored yet
+    """
+    path = _dataset_path(key)
+    try:
+        source = pa.memory_map(path, 'r')
+    except FileNotFoundError:
+        return None
+
+    # Mark it as recently used so pruning removes it last
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+def get_categorized_dataset(csv_bytes):
+    """
+    Get the categorized transactions for an uploaded CSV, processing it only
+    if no session has done so already.
+
+    Args:
+        csv_bytes (bytes): Raw contents of the CSV file
+
+    Returns:
+        tuple: (dataset key, memory-mapped categorized DataFrame)
+
+    Raises:
+        ValueError: If the CSV can't be processed
+    """
+    key = dataset_key(csv_bytes)
+    df = load_dataset(key)
+    if df is None:
+        categorized_df = categorize_transactions(process_csv(io.BytesIO(csv_bytes)))
+        save_dataset(key, categorized_df)
+
+        # Another session may have pruned it already; fall back to our own copy
+        df = load_dataset(key)
+        if df is None:
+            df = categorized_df
+    return key, df
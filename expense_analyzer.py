@@ -1,7 +1,10 @@
 import pandas as pd
+import numpy as np
 import io
 from datetime import datetime
-from categorization import categorize_transaction
+from categorization import categorize_dataframe, compile_rules, load_category_mapping
+from classifier import load_model, predict
+from parallel import map_partitions
 
 def process_csv(file):
     """
@@ -49,20 +52,55 @@ def process_csv(file):
     except Exception as e:
         raise ValueError(f"Error processing the CSV file: {str(e)}")
 
-def categorize_transactions(df):
+def _categorize_partition(df, rules, model):
+    """
+    Categorize one slice of transactions: rules first, then the fallback classifier.
+    
+    Args:
+        df: DataFrame slice containing transaction data
+        rules (list): Compiled categorization rules
+        model (dict): Fallback classifier, or None
+    
+    Returns:
+        numpy.ndarray: Category for each row
+    """
+    # Evaluate the categorization rules over the whole column at once
+    categories = categorize_dataframe(df, rules)
+    
+    # Let the fallback classifier have a go at anything left as "Other"
+    unmatched = categories == "Other"
+    if model is not None and unmatched.any():
+        categories[unmatched] = predict(model, df['Description'].to_numpy()[unmatched])
+    
+    return categories
+
+def categorize_transactions(df, model=None, backend=None, workers=None):
     """
     Apply the categorization logic to each transaction in the DataFrame.
     
+    Transactions no rule matches are passed to the fallback classifier,
+    if one has been trained.
+    
     Args:
         df: DataFrame containing transaction data
+        model (dict, optional): Fallback classifier; loaded from disk if omitted
+        backend (str, optional): "serial", "thread" or "process" (see parallel.py)
+        workers (int, optional): Number of row ranges to categorize in parallel
     
     Returns:
         DataFrame with added 'Category' column
     """
-    # Create a copy to avoid modifying the original
-    categorized_df = df.copy()
+    # A shallow copy shares the existing columns, so adding 'Category'
+    # leaves the original untouched without duplicating its data
+    categorized_df = df.copy(deep=False)
+    
+    # Load the rules and model once, then share them with every partition
+    rules = compile_rules(load_category_mapping())
+    if model is None:
+        model = load_model()
     
-    # Apply the categorization function to each description
-    categorized_df['Category'] = categorized_df['Description'].apply(categorize_transaction)
+    partials = map_partitions(_categorize_partition, categorized_df, rules, model,
+                              backend=backend, workers=workers)
+    categorized_df['Category'] = np.concatenate(partials)
     
     return categorized_df
@@ -0,0 +1,147 @@
+"""
+Load test for the Expense Analyzer HTTP API.
+Fires concurrent requests at a running instance (or starts one locally)
+and reports requests per second and latency percentiles per endpoint.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# One reusable connection per load-test thread in keep-alive mode
+_connections = threading.local()
+
+def _keep_alive_request(url, data):
+    """
+    Send one request over this thread's persistent connection.
+
+    Args:
+        url (str): Full URL
+        data (bytes, optional): CSV body to POST
+
+    Returns:
+        bytes: Response body
+
+    Raises:
+        RuntimeError: If the server answers with an error status
+    """
+    parts = urllib.parse.urlsplit(url)
+    connection = getattr(_connections, 'connection', None)
+    if connection is None or (connection.host, connection.port) != (parts.hostname, parts.port):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port)
+        _connections.connection = connection
+
+    headers = {'Content-Type': 'text/csv'} if data else {}
+    connection.request('POST' if data else 'GET', parts.path, body=data, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    if response.will_close:
+        connection.close()
+        _connections.connection = None
+    if response.status >= 400:
+        raise RuntimeError(f"{response.status} from {url}: {body[:200]!r}")
+    return body
+
+def request(url, data=None, keep_alive=False):
+    """
+    Send one request and time it.
+
+    Args:
+        url (str): Full URL
+        data (bytes, optional): CSV body to POST
+        keep_alive (bool): Reuse this thread's connection instead of opening a new one
+
+    Returns:
+        tuple: (latency in seconds, response body)
+    """
+    start = time.perf_counter()
+    if keep_alive:
+        body = _keep_alive_request(url, data)
+    else:
+        req = urllib.request.Request(url, data=data, headers={'Content-Type': 'text/csv'} if data else {})
+        with urllib.request.urlopen(req) as response:
+            body = response.read()
+    return time.perf_counter() - start, body
+
+def run_endpoint(label, url, total, concurrency, data=None, keep_alive=False):
+    """
+    Hit one endpoint with a fixed number of requests and print the results.
+
+    Args:
+        label (str): Name to print
+        url (str): Full URL
+        total (int): Number of requests
+        concurrency (int): Requests in flight at once
+        data (bytes or function, optional): CSV body to POST, or a function
+            taking the request number and returning the body
+        keep_alive (bool): Reuse one connection per load-test thread
+    """
+    def send(i):
+        return request(url, data(i) if callable(data) else data, keep_alive)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = [latency for latency, _ in pool.map(send, range(total))]
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    print(f"  - {label}: {total / elapsed:,.0f} req/s, "
+          f"p50 {np.percentile(latencies, 50):.1f}ms, "
+          f"p99 {np.percentile(latencies, 99):.1f}ms, "
+          f"max {latencies.max():.1f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Expense Analyzer HTTP API.")
+    parser.add_argument('--url', help="Base URL of a running API; starts a local one if omitted")
+    parser.add_argument('--csv', default='complex_transactions.csv', help="CSV file to upload")
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per cached endpoint")
+    parser.add_argument('--uncached-requests', type=int, default=200, help="Distinct uploads to process")
+    parser.add_argument('--concurrency', type=int, default=16, help="Requests in flight at once")
+    parser.add_argument('--workers', type=int, default=8, help="Pipeline concurrency for a local server")
+    parser.add_argument('--keep-alive', action='store_true',
+                        help="Reuse one connection per load-test thread, like a pooled HTTP client")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        from api import create_server
+        server = create_server(port=0, workers=args.workers, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    base_url = base_url.rstrip('/')
+
+    with open(args.csv, 'rb') as f:
+        csv_data = f.read()
+
+    print(f"\n===== API LOAD TEST ({base_url}) =====\n")
+    print(f"{args.uncached_requests} uncached uploads, {args.requests} requests per cached endpoint, "
+          f"{args.concurrency} at a time, {'keep-alive' if args.keep_alive else 'new connection per request'}\n")
+
+    # Every uncached upload gets one extra transaction, so each one is a
+    # different file and goes through the whole pipeline
+    def unique_csv(i):
+        return csv_data.rstrip(b"\n") + f"\n2000-01-01,Load test {i},-1.00\n".encode('utf-8')
+
+    run_endpoint("POST /datasets (uncached)", f"{base_url}/datasets", args.uncached_requests,
+                 args.concurrency, unique_csv, args.keep_alive)
+
+    # From here on the same file is reused, so requests are served from the cache
+    _, body = request(f"{base_url}/datasets", csv_data)
+    dataset_id = json.loads(body)["dataset_id"]
+
+    run_endpoint("POST /datasets (cached)", f"{base_url}/datasets", args.requests, args.concurrency,
+                 csv_data, args.keep_alive)
+    for view in ['summary', 'categories', 'monthly', 'insights', 'transactions']:
+        run_endpoint(f"GET /datasets/<id>/{view}", f"{base_url}/datasets/{dataset_id}/{view}",
+                     args.requests, args.concurrency, keep_alive=args.keep_alive)
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,139 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import reduce
+
+# How partitions are run: "serial", "thread" or "process"
+BACKENDS = ("serial", "thread", "process")
+
+def _check_settings(backend, workers):
+    """
+    Validate a backend name and worker count.
+
+    Args:
+        backend (str): Backend name
+        workers: Number of workers
+
+    Returns:
+        str: Problem description, or None if both are fine
+    """
+    if backend not in BACKENDS:
+        return f"Unknown execution backend '{backend}'. Use one of: {', '.join(BACKENDS)}."
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        return f"Number of workers must be a positive whole number, got {workers!r}."
+    return None
+
+def _settings_from_env():
+    """
+    Read the default backend and worker count from the environment.
+
+    A bad value falls back to its default (serial, one worker per CPU) with
+    a warning, rather than breaking every module that imports this one.
+
+    Returns:
+        tuple: (backend, workers)
+    """
+    default_workers = os.cpu_count() or 1
+    backend = os.getenv("EXPENSE_ANALYZER_BACKEND", "serial").strip().lower()
+    workers = os.getenv("EXPENSE_ANALYZER_WORKERS", "").strip() or str(default_workers)
+    workers = int(workers) if workers.isdigit() else workers
+
+    if _check_settings(backend, default_workers) is not None:
+        warnings.warn(f"Ignoring EXPENSE_ANALYZER_BACKEND: {_check_settings(backend, default_workers)} "
+                      f"Using the serial backend.")
+        backend = "serial"
+    if _check_settings(backend, workers) is not None:
+        warnings.warn(f"Ignoring EXPENSE_ANALYZER_WORKERS: {_check_settings(backend, workers)} "
+                      f"Using {default_workers} workers.")
+        workers = default_workers
+    return backend, workers
+
+DEFAULT_BACKEND, DEFAULT_WORKERS = _settings_from_env()
+
+# Pools are reused between calls so we only pay their startup cost once
+_executors = {}
+
+def _get_executor(backend, workers):
+    """
+    Get a cached worker pool for a backend.
+
+    Args:
+        backend (str): "thread" or "process"
+        workers (int): Pool size
+
+    Returns:
+        concurrent.futures.Executor: The pool
+    """
+    key = (backend, workers)
+    if key not in _executors:
+        if backend == "thread":
+            _executors[key] = ThreadPoolExecutor(max_workers=workers)
+        else:
+            _executors[key] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[key]
+
+def partition(df, n_partitions):
+    """
+    Split a DataFrame into contiguous row ranges of roughly equal size.
+
+    Args:
+        df: DataFrame to split
+        n_partitions (int): Number of pieces
+
+    Returns:
+        list: DataFrame slices, in row order
+    """
+    n_partitions = max(1, min(n_partitions, len(df)))
+    bounds = [len(df) * i // n_partitions for i in range(n_partitions + 1)]
+    return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+def map_partitions(func, df, *args, backend=None, workers=None):
+    """
+    Run a function over row ranges of a DataFrame using the chosen backend.
+
+    With the serial backend the function is simply called on the whole
+    DataFrame. For the process backend, func must be defined at module
+    level so it can be sent to the worker processes.
+
+    Args:
+        func: Function taking a DataFrame (plus args) and returning a partial result
+        df: DataFrame to process
+        *args: Extra arguments passed to every call
+        backend (str, optional): "serial", "thread" or "process"
+        workers (int, optional): Number of partitions and workers
+
+    Returns:
+        list: One result per partition, in row order
+
+    Raises:
+        ValueError: If the backend is unknown or the worker count isn't positive
+    """
+    backend = backend or DEFAULT_BACKEND
+    workers = workers or DEFAULT_WORKERS
+    problem = _check_settings(backend, workers)
+    if problem is not None:
+        raise ValueError(problem)
+
+    if backend == "serial" or workers == 1 or len(df) < 2:
+        return [func(df, *args)]
+
+    partitions = partition(df, workers)
+    executor = _get_executor(backend, workers)
+    return list(executor.map(func, partitions, *[[arg] * len(partitions) for arg in args]))
+
+def map_reduce(func, merge, df, *args, backend=None, workers=None):
+    """
+    Run a function over row ranges and combine the partial results.
+
+    Args:
+        func: Function taking a DataFrame (plus args) and returning a partial result
+        merge: Associative function combining two partial results
+        df: DataFrame to process
+        *args: Extra arguments passed to every call
+        backend (str, optional): "serial", "thread" or "process"
+        workers (int, optional): Number of partitions and workers
+
+    Returns:
+        The merged result
+    """
+    return reduce(merge, map_partitions(func, df, *args, backend=backend, workers=workers))
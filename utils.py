@@ -1,4 +1,65 @@
 import pandas as pd
+from parallel import map_reduce
+
+def get_partial_aggregates(df, columns):
+    """
+    Sum and count expenses per group for one slice of rows.
+    
+    Partial results from different slices can be combined with
+    merge_aggregates in any grouping, which is what lets the work be split
+    across workers.
+    
+    Args:
+        df: DataFrame (or slice of one) with transactions
+        columns (list): Columns to group by, each one separately
+    
+    Returns:
+        dict: Column name to a DataFrame with 'sum' and 'count' columns
+    """
+    # Filter for expenses (negative amounts)
+    expenses_df = df[df['Amount'] < 0]
+    
+    return {
+        column: expenses_df.groupby(column)['Amount'].agg(['sum', 'count'])
+        for column in columns
+    }
+
+def merge_aggregates(left, right):
+    """
+    Combine two partial aggregates by adding sums and counts per group.
+    
+    Args:
+        left (dict): Result of get_partial_aggregates or merge_aggregates
+        right (dict): Another partial result for the same columns
+    
+    Returns:
+        dict: Combined aggregates
+    """
+    return {column: left[column].add(right[column], fill_value=0) for column in left}
+
+def aggregate_expenses(df, columns=('Category', 'Month'), backend=None, workers=None):
+    """
+    Sum and count expenses per group, optionally in parallel.
+    
+    Only the requested groupings are computed, so callers that need just
+    one of them don't pay for the others.
+    
+    Args:
+        df: DataFrame with transactions
+        columns (sequence): Columns to group by, each one separately
+        backend (str, optional): "serial", "thread" or "process" (see parallel.py)
+        workers (int, optional): Number of row ranges to aggregate in parallel
+    
+    Returns:
+        dict: Column name to a DataFrame with 'sum' and 'count' columns,
+        sorted by group
+    """
+    aggregates = map_reduce(get_partial_aggregates, merge_aggregates, df, list(columns),
+                            backend=backend, workers=workers)
+    for column, totals in aggregates.items():
+        totals['count'] = totals['count'].astype(int)
+        aggregates[column] = totals.sort_index()
+    return aggregates
 
 def get_total_expenses(df):
     """
@@ -14,22 +75,23 @@ def get_total_expenses(df):
     expenses = df[df['Amount'] < 0]['Amount'].sum()
     return expenses
 
-def get_top_spending_category(df):
+def get_top_spending_category(df, backend=None, workers=None):
     """
     Find the category with the highest spending.
     
     Args:
         df: DataFrame with categorized transactions
+        backend (str, optional): Execution backend for the aggregation
+        workers (int, optional): Number of workers for the aggregation
     
     Returns:
         dict: Category name and amount
     """
-    # Filter for expenses (negative amounts)
-    expenses_df = df[df['Amount'] < 0].copy()
+    # Expense totals per category
+    category_totals = aggregate_expenses(df, ['Category'], backend, workers)['Category']['sum']
     
-    # Group by category and find the one with the highest (absolute) total
-    if len(expenses_df) > 0:
-        category_totals = expenses_df.groupby('Category')['Amount'].sum()
+    # Find the one with the highest (absolute) total
+    if len(category_totals) > 0:
         top_category = category_totals.abs().idxmax()
         top_amount = category_totals[top_category]
         
@@ -61,21 +123,20 @@ def get_average_transaction(df):
     else:
         return 0
 
-def get_month_over_month_change(df):
+def get_month_over_month_change(df, backend=None, workers=None):
     """
     Calculate the percentage change in spending compared to the previous month.
     
     Args:
         df: DataFrame with transactions
+        backend (str, optional): Execution backend for the aggregation
+        workers (int, optional): Number of workers for the aggregation
     
     Returns:
         float: Percentage change
     """
-    # Filter for expenses (negative amounts)
-    expenses_df = df[df['Amount'] < 0].copy()
-    
-    # Group by month and calculate totals
-    monthly_totals = expenses_df.groupby('Month')['Amount'].sum().abs()
+    # Expense totals per month
+    monthly_totals = aggregate_expenses(df, ['Month'], backend, workers)['Month']['sum'].abs()
     
     if len(monthly_totals) >= 2:
         # Sort by month
@@ -90,3 +151,60 @@ def get_month_over_month_change(df):
         return percent_change
     else:
         return 0
+
+def get_category_totals(df, backend=None, workers=None):
+    """
+    Calculate total spending per category, biggest first.
+    
+    Args:
+        df: DataFrame with categorized transactions
+        backend (str, optional): Execution backend for the aggregation
+        workers (int, optional): Number of workers for the aggregation
+    
+    Returns:
+        DataFrame with 'Category' and 'Amount' (positive) columns
+    """
+    # Expense totals per category
+    category_sums = aggregate_expenses(df, ['Category'], backend, workers)['Category']['sum']
+    category_totals = category_sums.abs().rename('Amount').reset_index()
+    return category_totals.sort_values('Amount', ascending=False)
+
+def get_monthly_totals(df, backend=None, workers=None):
+    """
+    Calculate total spending per month, in month order.
+    
+    Args:
+        df: DataFrame with transactions
+        backend (str, optional): Execution backend for the aggregation
+        workers (int, optional): Number of workers for the aggregation
+    
+    Returns:
+        DataFrame with 'Month' and 'Amount' (positive) columns
+    """
+    # Expense totals per month, already in month order
+    monthly_sums = aggregate_expenses(df, ['Month'], backend, workers)['Month']['sum']
+    return monthly_sums.abs().rename('Amount').reset_index()
+
+def get_category_stats(df, backend=None, workers=None):
+    """
+    Calculate total, average and count of expenses per category, biggest first.
+    
+    Args:
+        df: DataFrame with categorized transactions
+        backend (str, optional): Execution backend for the aggregation
+        workers (int, optional): Number of workers for the aggregation
+    
+    Returns:
+        DataFrame with 'Category', 'Total_Amount', 'Average_Transaction'
+        and 'Number_of_Transactions' columns
+    """
+    # Create statistics by category from the summed totals and counts
+    by_category = aggregate_expenses(df, ['Category'], backend, workers)['Category']
+    category_stats = pd.DataFrame({
+        'Total_Amount': by_category['sum'].abs(),
+        'Average_Transaction': (by_category['sum'] / by_category['count']).abs(),
+        'Number_of_Transactions': by_category['count']
+    }).reset_index()
+    
+    # Sort by total amount
+    return category_stats.sort_values('Total_Amount', ascending=False)
@@ -1,6 +1,7 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils import get_category_totals, get_monthly_totals, get_category_stats
 
 def create_category_pie_chart(df):
     """
@@ -12,12 +13,8 @@ def create_category_pie_chart(df):
     Returns:
         Plotly figure object
     """
-    # Filter for expenses (negative amounts)
-    expenses_df = df[df['Amount'] < 0].copy()
-    
-    # Group by category and sum amounts
-    category_totals = expenses_df.groupby('Category')['Amount'].sum().abs().reset_index()
-    category_totals = category_totals.sort_values('Amount', ascending=False)
+    # Total expenses per category
+    category_totals = get_category_totals(df)
     
     # Create the pie chart
     fig = px.pie(
@@ -49,12 +46,8 @@ def create_monthly_bar_chart(df):
     Returns:
         Plotly figure object
     """
-    # Filter for expenses (negative amounts)
-    expenses_df = df[df['Amount'] < 0].copy()
-    
-    # Group by month and sum amounts
-    monthly_totals = expenses_df.groupby('Month')['Amount'].sum().abs().reset_index()
-    monthly_totals = monthly_totals.sort_values('Month')
+    # Total expenses per month
+    monthly_totals = get_monthly_totals(df)
     
     # Create the bar chart
     fig = px.bar(
@@ -85,18 +78,8 @@ def create_category_breakdown_table(df):
     Returns:
         DataFrame with category breakdown statistics
     """
-    # Filter for expenses (negative amounts)
-    expenses_df = df[df['Amount'] < 0].copy()
-    
-    # Create statistics by category
-    category_stats = expenses_df.groupby('Category').agg(
-        Total_Amount=('Amount', lambda x: abs(sum(x))),
-        Average_Transaction=('Amount', lambda x: abs(sum(x)/len(x))),
-        Number_of_Transactions=('Amount', 'count')
-    ).reset_index()
-    
-    # Sort by total amount
-    category_stats = category_stats.sort_values('Total_Amount', ascending=False)
+    # Statistics by category, biggest first
+    category_stats = get_category_stats(df)
     
     # Format the columns
     category_stats['Total_Amount'] = category_stats['Total_Amount'].map('${:,.2f}'.format)